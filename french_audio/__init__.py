@@ -0,0 +1 @@
+"""Python helpers shared by the card-generation scripts."""
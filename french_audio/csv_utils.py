@@ -0,0 +1,78 @@
+"""Reading lemmas out of the Lexique.org words.csv export."""
+
+import csv
+import mmap
+import os
+from collections.abc import Iterator
+
+try:
+    import pandas as pd  # optional: C-backed CSV parsing for large word lists
+except ImportError:
+    pd = None
+
+CSV_CHUNK_SIZE = 50_000  # rows of words.csv read at a time
+
+
+def extract_lemmas(csv_path: str, chunksize: int = CSV_CHUNK_SIZE) -> Iterator[str]:
+    """Yield unique lemmas from words.csv lazily, preserving frequency order.
+
+    The file is read `chunksize` rows at a time, with pandas' C parser when
+    it is installed and a memory-mapped scan otherwise.
+    """
+    read_chunks = _read_chunks_pandas if pd is not None else _read_chunks_mmap
+    seen = set()
+    for chunk in read_chunks(csv_path, chunksize):
+        for lemme in chunk:
+            if lemme and lemme not in seen:
+                seen.add(lemme)
+                yield lemme
+
+
+def _read_chunks_pandas(csv_path: str, chunksize: int) -> Iterator[list[str]]:
+    """Yield the stripped lemma column in lists of up to `chunksize` rows."""
+    try:
+        reader = pd.read_csv(
+            csv_path,
+            usecols=[1],
+            skiprows=2,  # description row + header row (freq, lemme, ...)
+            header=None,
+            encoding="utf-8-sig",
+            dtype=str,
+            keep_default_na=False,  # keep lemmas like "nan" / "null" as text
+            chunksize=chunksize,
+        )
+    except pd.errors.EmptyDataError:
+        return  # export with only the description and header rows
+    for chunk in reader:
+        yield chunk[1].str.strip().tolist()
+
+
+def _read_chunks_mmap(csv_path: str, chunksize: int) -> Iterator[list[str]]:
+    """Fallback for _read_chunks_pandas when pandas is not available.
+
+    Scans the memory-mapped file line by line and only splits off the first
+    two fields; lines with a quote in either of them go through csv.reader.
+    """
+    with open(csv_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.readline()  # skip description row
+            mm.readline()  # skip header row (freq, lemme, ...)
+            chunk = []
+            for line in iter(mm.readline, b""):
+                parts = line.split(b",", 2)
+                if len(parts) < 2:
+                    continue
+                if b'"' in parts[0] or b'"' in parts[1]:
+                    row = next(csv.reader([line.decode("utf-8")]))
+                    if len(row) < 2:
+                        continue
+                    chunk.append(row[1].strip())
+                else:
+                    chunk.append(parts[1].decode("utf-8").strip())
+                if len(chunk) >= chunksize:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
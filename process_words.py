@@ -1,47 +1,52 @@
-import csv
 import json
 
-def generate_placeholder_prompts(lemme, num_prompts=3):
-    prompts = []
-    for i in range(num_prompts):
-        prompts.append({
-            "sentence": f"PLACEHOLDER: Sentence for '{lemme}' (context {i+1}).",
-            "hint": f"PLACEHOLDER: Hint for '{lemme}' (concept {i+1}).",
-            "acceptedAnswers": [lemme] # Start with the lemma as a default accepted answer
-        })
-    return prompts
-
-def extract_lemmas(file_path):
-    lemmas = []
-    with open(file_path, 'r', encoding='utf-8-sig') as csvfile:
-        reader = csv.reader(csvfile)
-        next(reader)  # Skip first header row
-        next(reader)  # Skip second header row (freq,lemme,...)
-        for row in reader:
-            if len(row) > 1:
-                lemme = row[1].strip()
-                if lemme and lemme not in lemmas:
-                    lemmas.append(lemme)
-    return lemmas
+from french_audio.csv_utils import extract_lemmas
+
+try:
+    import orjson  # optional: faster JSON serialization
+except ImportError:
+    orjson = None
+
+# Per-prompt tails of the placeholder sentence/hint; only the lemma varies per call
+_PLACEHOLDER_SUFFIXES = [(f"' (context {i}).", f"' (concept {i}).") for i in range(1, 4)]
+
+def generate_placeholder_prompts(lemme):
+    sentence = "PLACEHOLDER: Sentence for '" + lemme
+    hint = "PLACEHOLDER: Hint for '" + lemme
+    return [{
+        "sentence": sentence + sentence_tail,
+        "hint": hint + hint_tail,
+        "acceptedAnswers": [lemme] # Start with the lemma as a default accepted answer
+    } for sentence_tail, hint_tail in _PLACEHOLDER_SUFFIXES]
+
+def _encode_json(obj):
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+def stream_json_dict(path, items):
+    # Write (key, value) pairs as one JSON object, formatted like
+    # json.dump(..., indent=2), without holding the whole dict in memory.
+    count = 0
+    with open(path, 'wb') as f:
+        for key, value in items:
+            f.write(b'{\n  ' if count == 0 else b',\n  ')
+            f.write(_encode_json(key))
+            f.write(b': ')
+            f.write(_encode_json(value).replace(b'\n', b'\n  '))
+            count += 1
+        f.write(b'{}' if count == 0 else b'\n}')
+    return count
 
 def main():
     csv_file = "words.csv"
     output_json_file = "public/cards.json"
 
-    print(f"Extracting lemmas from {csv_file}...")
-    lemmas = extract_lemmas(csv_file)
-    print(f"Found {len(lemmas)} unique lemmas.")
-
-    cards_data = {}
-    for i, lemme in enumerate(lemmas):
-        # print(f"Generating placeholders for lemma {i+1}/{len(lemmas)}: {lemme}")
-        prompts = generate_placeholder_prompts(lemme)
-        if prompts:
-            cards_data[lemme] = prompts
-
-    print(f"Writing generated cards to {output_json_file}...")
-    with open(output_json_file, 'w', encoding='utf-8') as jsonfile:
-        json.dump(cards_data, jsonfile, ensure_ascii=False, indent=2)
+    print(f"Extracting lemmas from {csv_file} into {output_json_file}...")
+    cards = ((lemme, generate_placeholder_prompts(lemme))
+             for lemme in extract_lemmas(csv_file))
+    count = stream_json_dict(output_json_file, cards)
+    print(f"Wrote placeholder cards for {count} unique lemmas.")
     print("Process completed.")
 
 if __name__ == "__main__":
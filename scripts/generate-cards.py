@@ -10,193 +10,467 @@ Usage:
 """
 
 import argparse
-import csv
+import asyncio
 import json
 import os
 import re
 import sys
 import time
+from collections import deque
+from collections.abc import Iterator
+from itertools import islice
 
+import httpx
 from google import genai
+from google.genai import types
+
+# Make the repo-root french_audio package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from french_audio.csv_utils import extract_lemmas
+
+try:
+    import orjson  # optional: faster JSON parsing / serialization
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # optional: stream JSON keys without building the card lists
+    _KEY_SCAN_ERRORS = (json.JSONDecodeError, IOError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _KEY_SCAN_ERRORS = (json.JSONDecodeError, IOError)
 
 # Load .env file if present (no extra dependency needed)
 def load_dotenv(env_path: str):
     """Load key=value pairs from a .env file into os.environ."""
-    if not os.path.exists(env_path):
+    try:
+        f = open(env_path, "r", encoding="utf-8")
+    except FileNotFoundError:
         return
-    with open(env_path, "r", encoding="utf-8") as f:
+    with f:
         for line in f:
             line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
+            if not line or line[0] == "#":
+                continue
+            key, sep, value = line.partition("=")
+            if not sep:
                 continue
-            key, _, value = line.partition("=")
             os.environ.setdefault(key.strip(), value.strip())
 
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
-BATCH_SIZE = 20          # words per API call
+BATCH_SIZE = 20          # words per API call (starting size; adapts during the run)
+MIN_BATCH_SIZE = 5
+MAX_BATCH_SIZE = 100
 MODEL_NAME = "gemini-2.5-flash-lite"
 MAX_RPM = 10             # Gemini 2.5 Flash Lite free tier rate limit
-SLEEP_BETWEEN = 60 / MAX_RPM + 2.0  # ~8s between requests (stay safe)
+MAX_CONCURRENT = 5       # API requests in flight at once
+HTTP_TIMEOUT_MS = 60_000  # per-request timeout
+KEEPALIVE_EXPIRY = 90    # seconds an idle connection stays pooled (> gap between requests)
 MAX_RETRIES = 5
+COMPACT_EVERY = 25        # batches between folding the .jsonl log into the .json
+
+# Precompiled regex patterns
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)```", re.DOTALL)
+_FENCE_STRIP = re.compile(r"```(?:json)?\s*\n?")
+_RETRY_RE = re.compile(r"retry in ([\d.]+)s", re.IGNORECASE)
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(SCRIPT_DIR)
 CSV_PATH = os.path.join(ROOT_DIR, "words.csv")
 PROMPT_PATH = os.path.join(ROOT_DIR, "prompt.md")
+PROMPT_CACHE_PATH = os.path.join(ROOT_DIR, "prompt.cache.md")  # prompt.md with fences stripped
 OUTPUT_PATH = os.path.join(ROOT_DIR, "generated-cards.json")
+LOG_PATH = os.path.join(ROOT_DIR, "generated-cards.jsonl")  # per-batch append log
+DONE_PATH = os.path.join(ROOT_DIR, "generated-cards.done")  # output stamp, then one finished lemma per line
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def extract_lemmas(csv_path: str) -> list[str]:
-    """Read unique lemmas from words.csv, preserving frequency order."""
-    lemmas = []
-    with open(csv_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.reader(f)
-        next(reader)  # skip description row
-        next(reader)  # skip header row (freq, lemme, ...)
-        for row in reader:
-            if len(row) > 1:
-                lemme = row[1].strip()
-                if lemme and lemme not in lemmas:
-                    lemmas.append(lemme)
-    return lemmas
-
-
-def load_prompt_template(prompt_path: str) -> str:
-    """Load prompt.md and extract everything up to and including {LEMMA_LIST}."""
-    with open(prompt_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # Extract the system prompt section + everything after it
-    # The full file IS the prompt, with {LEMMA_LIST} placeholder at the end
-    # Strip markdown code fences from the examples (Gemini gets confused by them)
-    content = re.sub(r"```json\s*\n?", "", content)
-    content = re.sub(r"```\s*\n?", "", content)
-    return content
-
-
-def build_prompt(template: str, lemmas: list[str]) -> str:
-    """Replace {LEMMA_LIST} placeholder with actual comma-separated lemmas."""
-    lemma_list = ", ".join(lemmas)
-    return template.replace("{LEMMA_LIST}", lemma_list)
-
-
-def load_existing(output_path: str) -> dict:
-    """Load previously generated cards for resume support."""
+def load_prompt_template(prompt_path: str, cache_path: str) -> tuple[str, str]:
+    """Load prompt.md and split it around the {LEMMA_LIST} placeholder.
+
+    Returns (prefix, suffix) so each batch's prompt is a single concatenation.
+    The fence-stripped text is cached in cache_path, stamped with prompt.md's
+    mtime, and reused until prompt.md changes.
+    """
+    mtime = os.path.getmtime(prompt_path)
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) == mtime:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            content = f.read()
+    else:
+        with open(prompt_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        # Extract the system prompt section + everything after it
+        # The full file IS the prompt, with {LEMMA_LIST} placeholder at the end
+        # Strip markdown code fences from the examples (Gemini gets confused by them)
+        content = _FENCE_STRIP.sub("", content)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.utime(cache_path, (mtime, mtime))
+
+    prefix, placeholder, suffix = content.partition("{LEMMA_LIST}")
+    if not placeholder:
+        raise ValueError(f"{prompt_path} has no {{LEMMA_LIST}} placeholder")
+    return prefix, suffix
+
+
+def build_prompt(template: tuple[str, str], lemmas: list[str]) -> str:
+    """Fill the {LEMMA_LIST} slot with actual comma-separated lemmas."""
+    prefix, suffix = template
+    return f"{prefix}{', '.join(lemmas)}{suffix}"
+
+
+def _load_output(output_path: str) -> dict | None:
+    """Parse the JSON output: {} if it does not exist, None if it is unreadable."""
+    if not os.path.exists(output_path):
+        return {}
+    try:
+        with open(output_path, "rb") as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson else json.loads(raw)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+def _read_log(log_path: str) -> Iterator[dict]:
+    """Yield the entries of the JSONL log, if there is one."""
+    if not os.path.exists(log_path):
+        return
+    with open(log_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line) if orjson else json.loads(line)
+            except json.JSONDecodeError:
+                pass  # truncated last line from an interrupted run
+
+
+def load_existing(output_path: str, log_path: str) -> dict:
+    """Load previously generated cards for resume support.
+
+    Entries appended to the JSONL log since the last compaction override
+    those in the JSON output.
+    """
+    existing = _load_output(output_path) or {}
+    for entry in _read_log(log_path):
+        existing.update(entry)
+    return existing
+
+
+def load_existing_keys(output_path: str, log_path: str) -> set[str]:
+    """Return the lemmas already generated without keeping their cards in memory.
+
+    With ijson installed, only the top-level keys of the JSON output are
+    decoded; otherwise the file is parsed and everything but the keys dropped.
+    """
+    keys = set()
     if os.path.exists(output_path):
         try:
-            with open(output_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
-    return {}
+            with open(output_path, "rb") as f:
+                if ijson:
+                    keys.update(value for prefix, event, value in ijson.parse(f)
+                                if prefix == "" and event == "map_key")
+                else:
+                    raw = f.read()
+                    keys.update(orjson.loads(raw) if orjson else json.loads(raw))
+        except _KEY_SCAN_ERRORS:
+            keys = set()
+    for entry in _read_log(log_path):
+        keys.update(entry)
+    return keys
 
 
 def save_output(output_path: str, data: dict):
-    """Write generated cards to disk."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """Write generated cards to disk atomically (temp file + rename)."""
+    tmp_path = output_path + ".tmp"
+    if orjson:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, output_path)
+
+
+def append_output(log_path: str, batch: dict):
+    """Append one batch of generated cards to the JSONL log, one lemma per line."""
+    with open(log_path, "ab") as f:
+        for lemma, cards in batch.items():
+            entry = {lemma: cards}
+            if orjson:
+                f.write(orjson.dumps(entry) + b"\n")
+            else:
+                f.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def compact_output(output_path: str, log_path: str, done_path: str):
+    """Fold the JSONL log into the JSON output, then drop the log.
+
+    An existing output that cannot be parsed is left untouched (and the log
+    kept) rather than overwritten with just the log's entries.
+    """
+    if not os.path.exists(log_path):
+        return
+    if _load_output(output_path) is None:
+        print(f"  Warning: cannot parse {output_path}; keeping {log_path} "
+              f"instead of overwriting it. Fix or remove the file to compact.")
+        return
+    data = load_existing(output_path, log_path)
+    save_output(output_path, data)
+    save_done(done_path, output_path, data)
+    os.remove(log_path)
+
+
+def _output_stamp(output_path: str) -> str:
+    """Identify the current version of the JSON output by mtime and size."""
+    try:
+        st = os.stat(output_path)
+    except FileNotFoundError:
+        return "missing"
+    return f"{st.st_mtime_ns} {st.st_size}"
+
+
+def load_done(done_path: str, output_path: str) -> set[str] | None:
+    """Read the set of already-generated lemmas from the sidecar.
+
+    Returns None if there is no sidecar, or if the JSON output has changed
+    since the sidecar was written (deleted, checked out, corrupted...), in
+    which case the caller must rebuild it from the output itself.
+    """
+    try:
+        with open(done_path, "r", encoding="utf-8") as f:
+            if f.readline().rstrip("\n") != _output_stamp(output_path):
+                return None
+            return set(f.read().splitlines())
+    except FileNotFoundError:
+        return None
+
+
+def save_done(done_path: str, output_path: str, lemmas):
+    """Rewrite the sidecar, stamped with the current JSON output's version."""
+    tmp_path = done_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(_output_stamp(output_path) + "\n")
+        f.writelines(lemma + "\n" for lemma in lemmas)
+    os.replace(tmp_path, done_path)
+
+
+def append_done(done_path: str, lemmas):
+    """Record lemmas as generated in the sidecar file."""
+    with open(done_path, "a", encoding="utf-8") as f:
+        f.writelines(lemma + "\n" for lemma in lemmas)
 
 
 def extract_json_from_response(text: str) -> dict:
     """Parse JSON from Gemini response, handling markdown fences."""
     text = text.strip()
     # Strip markdown code fences if present
-    match = re.search(r"```(?:json)?\s*\n?(.*?)```", text, re.DOTALL)
+    match = _FENCE_RE.search(text)
     if match:
         text = match.group(1).strip()
-    return json.loads(text)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(text) if orjson else json.loads(text)
+
+
+class RateLimiter:
+    """Sliding-window limiter allowing at most `rpm` requests per 60 seconds.
+
+    A 429 halves the allowed rate; each successful request raises it by one,
+    back up to the configured ceiling.
+    """
+
+    def __init__(self, max_rpm: int):
+        self.max_rpm = max_rpm
+        self.rpm = max_rpm
+        self.request_times = deque()
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        """Wait until another request fits in the window, then record it."""
+        async with self._lock:  # waiters are released one at a time, in order
+            while True:
+                now = time.monotonic()
+                while self.request_times and now - self.request_times[0] >= 60:
+                    self.request_times.popleft()
+                if len(self.request_times) < self.rpm:
+                    self.request_times.append(now)
+                    return
+                await asyncio.sleep(self.request_times[0] + 60 - now)
+
+    def on_success(self):
+        self.rpm = min(self.rpm + 1, self.max_rpm)
+
+    def on_rate_limited(self):
+        self.rpm = max(self.rpm // 2, 1)
 
 
 def validate_card(lemma: str, cards: list) -> list:
     """Validate and clean a list of card objects for a given lemma."""
-    valid = []
-    for card in cards:
-        if not isinstance(card, dict):
-            continue
-        sentence = card.get("sentence", "")
-        hint = card.get("hint", "")
-        answers = card.get("acceptedAnswers", [])
-        if not sentence or not hint or not answers:
-            continue
-        if "___" not in sentence:
-            continue
-        if not isinstance(answers, list) or len(answers) == 0:
-            continue
-        valid.append({
-            "sentence": sentence,
-            "hint": hint,
-            "acceptedAnswers": answers,
-        })
-    return valid
-
-
-def generate_batch(client, template: str, lemmas: list[str]) -> dict:
-    """Send a batch of lemmas to Gemini and return parsed card data."""
+    return [
+        {"sentence": sentence, "hint": hint, "acceptedAnswers": answers}
+        for card in cards if isinstance(card, dict)
+        for sentence, hint, answers in [(card.get("sentence", ""),
+                                         card.get("hint", ""),
+                                         card.get("acceptedAnswers", []))]
+        if sentence and hint and isinstance(answers, list) and answers
+        and "___" in sentence
+    ]
+
+
+async def generate_batch(client, limiter: RateLimiter, template: tuple[str, str],
+                         lemmas: list[str]) -> dict:
+    """Send a batch of lemmas to Gemini and return parsed card data.
+
+    Batches run concurrently, so every line printed here is tagged with the
+    batch's first and last lemma (as in generate_all's "Batch N" header).
+    """
     prompt = build_prompt(template, lemmas)
+    tag = f"  [{lemmas[0]} ... {lemmas[-1]}]"
 
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            response = client.models.generate_content(
+            await limiter.wait()
+            response = await client.aio.models.generate_content(
                 model=MODEL_NAME,
                 contents=prompt,
             )
+            limiter.on_success()
             data = extract_json_from_response(response.text)
 
             if not isinstance(data, dict):
                 raise ValueError("Response is not a JSON object")
 
-            # Validate each lemma's cards
-            result = {}
-            for lemma in lemmas:
-                if lemma in data:
-                    validated = validate_card(lemma, data[lemma])
-                    if validated:
-                        result[lemma] = validated
-                    else:
-                        print(f"  Warning: no valid cards for '{lemma}' in response")
-                else:
-                    print(f"  Warning: '{lemma}' missing from response")
+            # Validate each lemma's cards, reporting problems once per batch
+            validated = {lemma: validate_card(lemma, data[lemma])
+                         for lemma in lemmas if lemma in data}
+            result = {lemma: cards for lemma, cards in validated.items() if cards}
+            missing = [lemma for lemma in lemmas if lemma not in data]
+            no_valid = [lemma for lemma, cards in validated.items() if not cards]
+            if missing:
+                print(f"{tag} Warning: {len(missing)} missing from response: {', '.join(missing)}")
+            if no_valid:
+                print(f"{tag} Warning: no valid cards for {len(no_valid)}: {', '.join(no_valid)}")
 
             return result
 
         except json.JSONDecodeError as e:
-            print(f"  JSON parse error (attempt {attempt}/{MAX_RETRIES}): {e}")
+            print(f"{tag} JSON parse error (attempt {attempt}/{MAX_RETRIES}): {e}")
             if attempt < MAX_RETRIES:
-                time.sleep(2 ** attempt)
+                await asyncio.sleep(2 ** attempt)
         except Exception as e:
             error_msg = str(e)
             if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
+                limiter.on_rate_limited()
                 # Try to extract retry delay from error message
                 wait = 30 * attempt  # default
-                retry_match = re.search(r"retry in ([\d.]+)s", error_msg, re.IGNORECASE)
+                retry_match = _RETRY_RE.search(error_msg)
                 if retry_match:
                     wait = max(int(float(retry_match.group(1))) + 5, wait)
-                print(f"  Rate limited. Waiting {wait}s (attempt {attempt}/{MAX_RETRIES})...")
-                time.sleep(wait)
+                print(f"{tag} Rate limited. Waiting {wait}s (attempt {attempt}/{MAX_RETRIES})...")
+                await asyncio.sleep(wait)
             else:
-                print(f"  API error (attempt {attempt}/{MAX_RETRIES}): {e}")
+                print(f"{tag} API error (attempt {attempt}/{MAX_RETRIES}): {e}")
                 if attempt < MAX_RETRIES:
-                    time.sleep(2 ** attempt)
+                    await asyncio.sleep(2 ** attempt)
 
     return {}
 
 
+async def generate_all(client, template: tuple[str, str], remaining: list[str],
+                       batch_size: int, max_concurrent: int,
+                       done: set[str]) -> tuple[int, list[str]]:
+    """Generate cards for `remaining` concurrently, saving results as they arrive.
+
+    Batches are cut from the queue when a request slot frees up, so their size
+    adapts to how well the model copes: a fully valid batch grows the next one
+    by 1.5x (up to MAX_BATCH_SIZE), any missing lemmas or a failed batch halve
+    it (down to MIN_BATCH_SIZE).
+
+    Closes the client's async connection pool when done. Returns (number of
+    newly generated lemmas, lemmas that failed).
+    """
+    limiter = RateLimiter(MAX_RPM)
+    queue = deque(remaining)
+    in_flight = {}  # task -> batch
+    min_size = min(MIN_BATCH_SIZE, batch_size)
+    completed = 0
+    generated_count = 0
+    failed_lemmas = []
+
+    try:
+        while queue or in_flight:
+            while queue and len(in_flight) < max_concurrent:
+                batch = [queue.popleft() for _ in range(min(batch_size, len(queue)))]
+                task = asyncio.create_task(generate_batch(client, limiter, template, batch))
+                in_flight[task] = batch
+
+            finished, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                batch = in_flight.pop(task)
+                result = task.result()
+                completed += 1
+                print(f"Batch {completed} ({len(batch)} words, {len(queue)} queued): "
+                      f"{batch[0]} ... {batch[-1]}")
+
+                if result:
+                    done.update(result)
+                    generated_count += len(result)
+                    # Track any lemmas that didn't come back
+                    for lemma in batch:
+                        if lemma not in result:
+                            failed_lemmas.append(lemma)
+                    # Append after each batch for resume support
+                    append_output(LOG_PATH, result)
+                    append_done(DONE_PATH, result)
+                    print(f"  Generated {len(result)}/{len(batch)} cards. Total: {len(done)}")
+                else:
+                    failed_lemmas.extend(batch)
+                    print(f"  Batch failed entirely.")
+
+                # Resize from the batch that just finished, not the current size:
+                # with several batches in flight, growing the current size on
+                # each success would compound within one round
+                if len(result) == len(batch):
+                    grown = min(max(len(batch) * 3 // 2, len(batch) + 1), MAX_BATCH_SIZE)
+                    batch_size = max(batch_size, grown)
+                else:
+                    batch_size = min(batch_size, max(len(batch) // 2, min_size))
+
+                if completed % COMPACT_EVERY == 0:
+                    compact_output(OUTPUT_PATH, LOG_PATH, DONE_PATH)
+    finally:
+        await client.aio.aclose()
+
+    return generated_count, failed_lemmas
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
+def positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate French flashcards via Gemini")
     parser.add_argument("--count", type=int, default=500,
                         help="Number of words to generate (0 = all). Default: 500")
-    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
-                        help=f"Words per API request. Default: {BATCH_SIZE}")
+    parser.add_argument("--batch-size", type=positive_int, default=BATCH_SIZE,
+                        help=f"Starting words per API request (adapts between "
+                             f"{MIN_BATCH_SIZE} and {MAX_BATCH_SIZE}). Default: {BATCH_SIZE}")
+    parser.add_argument("--concurrency", type=positive_int, default=MAX_CONCURRENT,
+                        help=f"API requests in flight at once. Default: {MAX_CONCURRENT}")
     args = parser.parse_args()
 
     # --- Load .env ---
@@ -210,26 +484,29 @@ def main():
         print("  2. Add your key from https://aistudio.google.com/apikey")
         sys.exit(1)
 
-    client = genai.Client(api_key=api_key)
-
     # --- Load data ---
     print(f"Reading lemmas from {CSV_PATH}...")
-    all_lemmas = extract_lemmas(CSV_PATH)
-    print(f"  Found {len(all_lemmas)} unique lemmas.")
-
-    count = args.count if args.count > 0 else len(all_lemmas)
-    target_lemmas = all_lemmas[:count]
+    count = args.count if args.count > 0 else None
+    target_lemmas = list(islice(extract_lemmas(CSV_PATH), count))
     print(f"  Targeting first {len(target_lemmas)} lemmas.")
 
     print(f"Loading prompt template from {PROMPT_PATH}...")
-    template = load_prompt_template(PROMPT_PATH)
+    template = load_prompt_template(PROMPT_PATH, PROMPT_CACHE_PATH)
 
-    print(f"Loading existing output from {OUTPUT_PATH}...")
-    existing = load_existing(OUTPUT_PATH)
-    print(f"  {len(existing)} lemmas already generated.")
+    # Fold in entries left over from an interrupted run
+    compact_output(OUTPUT_PATH, LOG_PATH, DONE_PATH)
+
+    print(f"Loading progress from {DONE_PATH}...")
+    done = load_done(DONE_PATH, OUTPUT_PATH)
+    if done is None:
+        # No sidecar, or it no longer matches the output: rebuild it from the cards
+        print(f"  Missing or out of date, reading {OUTPUT_PATH} instead.")
+        done = load_existing_keys(OUTPUT_PATH, LOG_PATH)
+        save_done(DONE_PATH, OUTPUT_PATH, done)
+    print(f"  {len(done)} lemmas already generated.")
 
     # --- Filter out already-generated lemmas ---
-    remaining = [l for l in target_lemmas if l not in existing]
+    remaining = [l for l in target_lemmas if l not in done]
     print(f"  {len(remaining)} lemmas remaining to generate.")
 
     if not remaining:
@@ -237,42 +514,33 @@ def main():
         return
 
     # --- Batch generation ---
-    batches = [remaining[i:i + args.batch_size]
-               for i in range(0, len(remaining), args.batch_size)]
-    total_batches = len(batches)
-    print(f"\nStarting generation: {len(remaining)} words in {total_batches} batches of up to {args.batch_size}")
-    print(f"Estimated time: ~{int(total_batches * SLEEP_BETWEEN / 60) + 1} minutes\n")
-
-    generated_count = 0
-    failed_lemmas = []
-
-    for i, batch in enumerate(batches):
-        print(f"Batch {i + 1}/{total_batches}: {batch[0]} ... {batch[-1]}")
-
-        result = generate_batch(client, template, batch)
-
-        if result:
-            existing.update(result)
-            generated_count += len(result)
-            # Track any lemmas that didn't come back
-            for lemma in batch:
-                if lemma not in result:
-                    failed_lemmas.append(lemma)
-            # Save after each batch for resume support
-            save_output(OUTPUT_PATH, existing)
-            print(f"  Generated {len(result)}/{len(batch)} cards. Total: {len(existing)}")
-        else:
-            failed_lemmas.extend(batch)
-            print(f"  Batch failed entirely.")
-
-        # Rate limit pause (skip after last batch)
-        if i < total_batches - 1:
-            time.sleep(SLEEP_BETWEEN)
+    max_batches = -(-len(remaining) // args.batch_size)
+    print(f"\nStarting generation: {len(remaining)} words, starting with batches of {args.batch_size}")
+    print(f"Estimated time: ~{max_batches // MAX_RPM + 1} minutes at the starting batch size "
+          f"(longer if batches shrink or requests are rate limited)\n")
+
+    # One client for the whole run, so pooled connections (and their TLS
+    # sessions) are reused across batches instead of re-handshaking each time
+    client = genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            timeout=HTTP_TIMEOUT_MS,
+            async_client_args={"limits": httpx.Limits(
+                max_keepalive_connections=args.concurrency,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            )},
+        ),
+    )
+    generated_count, failed_lemmas = asyncio.run(
+        generate_all(client, template, remaining, args.batch_size, args.concurrency, done))
+    client.close()
+
+    compact_output(OUTPUT_PATH, LOG_PATH, DONE_PATH)
 
     # --- Summary ---
     print(f"\n{'=' * 50}")
     print(f"Done! Generated cards for {generated_count} new lemmas.")
-    print(f"Total in {OUTPUT_PATH}: {len(existing)} lemmas.")
+    print(f"Total in {OUTPUT_PATH}: {len(done)} lemmas.")
     if failed_lemmas:
         print(f"\n{len(failed_lemmas)} lemmas failed (re-run to retry):")
         print(f"  {', '.join(failed_lemmas[:20])}{'...' if len(failed_lemmas) > 20 else ''}")